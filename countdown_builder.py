@@ -5,13 +5,14 @@ Countdown Audio Builder
 Generate a spoken-number countdown with beeps, rest prompts, and precise timing.
 Features:
   - gTTS with on-disk caching (so repeated runs are fast)
+  - Prepped PCM cached next to each MP3, so warm runs skip decoding
   - Retry logic for flaky TTS calls
   - Normalized loudness, short fades, mono + consistent sample rate
   - Sine-wave beeps (configurable frequency, duration, gain)
   - "Rest" prompts every N counts (configurable)
   - Lead-in prompt (optional)
   - Timeline .json with labeled cue times.0 (ms) for editors / apps
-  - Stream-safe assembly (build in WAV then export to MP3 once)
+  - Single-pass assembly (PCM placed into one preallocated buffer, exported to MP3 once)
   - NEW: --skip-first-rest N to skip the first N rest periods
   - NEW: --mode minutes for time-based countdown (e.g., "30 minutes remaining")
   - NEW: --speak-interval N to speak only every N minutes
@@ -20,18 +21,26 @@ Features:
 
 import argparse
 import hashlib
+import io
 import json
+import os
 import sys
-import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
+import numpy as np
 from gtts import gTTS
 from pydub import AudioSegment
-from pydub.generators import Sine
-from pydub.effects import normalize
+
+try:
+    import orjson
+except ImportError:  # optional speedup for timeline output
+    orjson = None
 
 # -----------------------------
 # Helpers
@@ -39,54 +48,189 @@ from pydub.effects import normalize
 
 TARGET_RATE = 44100
 
-def prep(seg: AudioSegment, fade_ms: int = 12) -> AudioSegment:
-    """Normalize, fade edges, and unify format (mono, sample rate)."""
-    return (
-        normalize(seg)
-        .fade_in(fade_ms)
-        .fade_out(fade_ms)
-        .set_channels(1)
-        .set_frame_rate(TARGET_RATE)
+def _fade_edges(samples: np.ndarray, fade_ms: int) -> None:
+    """Apply linear fade-in/out ramps to a float sample array in place."""
+    n = min(int(fade_ms * TARGET_RATE / 1000), len(samples) // 2)
+    if n > 0:
+        ramp = np.linspace(0.0, 1.0, n)
+        samples[:n] *= ramp
+        samples[-n:] *= ramp[::-1]
+
+def _from_samples(samples: np.ndarray) -> AudioSegment:
+    return AudioSegment(
+        data=np.rint(samples).astype(np.int16).tobytes(), sample_width=2, frame_rate=TARGET_RATE, channels=1
     )
 
+def _peak(samples: np.ndarray) -> int:
+    """Largest absolute sample value, as one vectorized reduction."""
+    if not len(samples):
+        return 0
+    return int(max(samples.max(), -int(samples.min())))
+
+def prep_fast(seg: AudioSegment, fade_ms: int = 12) -> AudioSegment:
+    """Unify format (mono, 16-bit, TARGET_RATE), then normalize and fade in a single NumPy pass."""
+    seg = seg.set_channels(1).set_frame_rate(TARGET_RATE).set_sample_width(2)
+    samples = np.frombuffer(seg.raw_data, dtype=np.int16).astype(np.float64)
+    peak = _peak(samples)
+    if peak:
+        # Same target as pydub's normalize(): peak at -0.1 dBFS
+        samples *= 32768 * 10 ** (-0.1 / 20) / peak
+    _fade_edges(samples, fade_ms)
+    return _from_samples(samples)
+
+class _Track:
+    """Mono int16 track built from placements: PCM at sample offsets, silence only moves the cursor."""
+
+    def __init__(self) -> None:
+        self.placements: List[Tuple[int, np.ndarray]] = []
+        self.cursor = 0  # in samples at TARGET_RATE
+
+    def add(self, seg: AudioSegment) -> None:
+        seg = seg.set_channels(1).set_frame_rate(TARGET_RATE).set_sample_width(2)
+        samples = np.frombuffer(seg.raw_data, dtype=np.int16)
+        self.placements.append((self.cursor, samples))
+        self.cursor += len(samples)
+
+    def skip(self, ms: int) -> None:
+        # Same frame count AudioSegment.silent() would produce
+        self.cursor += int(TARGET_RATE * (ms / 1000.0))
+
+    def render(self) -> AudioSegment:
+        out = np.zeros(self.cursor, dtype=np.int16)
+        for offset, samples in self.placements:
+            out[offset:offset + len(samples)] = samples
+        return AudioSegment(data=out.tobytes(), sample_width=2, frame_rate=TARGET_RATE, channels=1)
+
+def _sine(freq_hz: int, ms: int, gain_db: float, fade_ms: int = 12) -> AudioSegment:
+    """Synthesize a faded mono sine tone directly at TARGET_RATE as int16 PCM."""
+    t = np.arange(int(TARGET_RATE * ms / 1000)) / TARGET_RATE
+    wave = np.sin(2 * np.pi * freq_hz * t) * (10 ** (gain_db / 20) * 32767)
+    _fade_edges(wave, fade_ms)
+    return _from_samples(wave)
+
 def make_beep(freq_hz: int, ms: int, gain_db: float) -> AudioSegment:
-    return prep(Sine(freq_hz).to_audio_segment(duration=ms).apply_gain(gain_db))
+    return _sine(freq_hz, ms, gain_db)
 
 def make_end_beep(freq_hz: int, ms: int, gain_db: float) -> AudioSegment:
     """Create a distinctive end beep - longer duration and slightly higher pitch."""
     end_freq = int(freq_hz * 1.5)  # 50% higher frequency
     end_duration = ms * 3  # 3x longer
-    return prep(Sine(end_freq).to_audio_segment(duration=end_duration).apply_gain(gain_db))
-
-def tts_to_file(text: str, path: Path, lang: str = "en", tld: str = "com") -> None:
-    gTTS(text=text, lang=lang, tld=tld).save(str(path))
+    return _sine(end_freq, end_duration, gain_db)
 
 def tts_with_retry_to_audiosegment(
-    text: str, tmpdir: Path, lang: str = "en", tld: str = "com",
+    text: str, lang: str = "en", tld: str = "com",
     retries: int = 3, delay: float = 1.2
 ) -> AudioSegment:
     last_err = None
-    out_mp3 = tmpdir / "tts_tmp.mp3"
     for attempt in range(retries):
         try:
-            tts_to_file(text, out_mp3, lang=lang, tld=tld)
-            return AudioSegment.from_mp3(str(out_mp3))
+            buf = io.BytesIO()
+            gTTS(text=text, lang=lang, tld=tld).write_to_fp(buf)
+            buf.seek(0)
+            return AudioSegment.from_file(buf, format="mp3")
         except Exception as e:
             last_err = e
             if attempt < retries - 1:
                 time.sleep(delay * (attempt + 1))
     raise RuntimeError(f"TTS failed for '{text}': {last_err}")
 
+_hash = hashlib.blake2b
+
+def _in_cache(path: Path, existing: Optional[Set[str]]) -> bool:
+    """Membership test against a pre-listed cache directory, falling back to a stat."""
+    return path.name in existing if existing is not None else path.exists()
+
+def list_cache(cache_dir: Path) -> Set[str]:
+    """Snapshot the cache directory once so lookups don't stat every file."""
+    return set(os.listdir(cache_dir))
+
+def _tmp_path(path: Path) -> Path:
+    """Sibling name unique to this process and thread, for write-then-rename."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+def tts_cache_path(
+    text: str, cache_dir: Path, lang: str = "en", tld: str = "com",
+    existing: Optional[Set[str]] = None
+) -> Path:
+    key_src = f"{lang}|{tld}|{text}".encode("utf-8")
+    mp3_path = cache_dir / f"{_hash(key_src, digest_size=16).hexdigest()}.mp3"
+    if not _in_cache(mp3_path, existing):
+        # Caches written before the switch to BLAKE2 used MD5 names; adopt them in place
+        legacy = cache_dir / f"{hashlib.md5(key_src).hexdigest()}.mp3"
+        if _in_cache(legacy, existing):
+            legacy.replace(mp3_path)
+            if existing is not None:
+                existing.discard(legacy.name)
+                existing.add(mp3_path.name)
+    return mp3_path
+
 def tts_cached(
-    text: str, cache_dir: Path, tmpdir: Path, lang: str = "en", tld: str = "com",
-    retries: int = 3, delay: float = 1.2
+    text: str, cache_dir: Path, lang: str = "en", tld: str = "com",
+    retries: int = 3, delay: float = 1.2, existing: Optional[Set[str]] = None
+) -> AudioSegment:
+    mp3_path = tts_cache_path(text, cache_dir, lang, tld, existing)
+    if _in_cache(mp3_path, existing):
+        return AudioSegment.from_mp3(str(mp3_path))
+    seg = tts_with_retry_to_audiosegment(text, lang, tld, retries, delay)
+    # pydub creates the target before ffmpeg starts encoding; write-then-rename so
+    # a concurrent reader never sees an empty or partial MP3
+    tmp_path = _tmp_path(mp3_path)
+    try:
+        seg.export(str(tmp_path), format="mp3").close()  # export returns the file still open
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(mp3_path)
+    if existing is not None:
+        existing.add(mp3_path.name)
+    return seg
+
+# Bump when prep_fast's output changes so stale .raw files are ignored
+_PCM_CACHE_VERSION = 1
+
+def tts_prepped_cached(
+    text: str, cache_dir: Path, lang: str = "en", tld: str = "com", fade_ms: int = 12,
+    existing: Optional[Set[str]] = None
 ) -> AudioSegment:
-    key = hashlib.md5(f"{lang}|{tld}|{text}".encode("utf-8")).hexdigest()
-    mp3_path = cache_dir / f"{key}.mp3"
-    if not mp3_path.exists():
-        seg = tts_with_retry_to_audiosegment(text, tmpdir, lang, tld, retries, delay)
-        seg.export(str(mp3_path), format="mp3")
-    return AudioSegment.from_mp3(str(mp3_path))
+    """Like tts_cached + prep_fast, but keeps the prepped PCM on disk so warm runs skip MP3 decoding."""
+    mp3_path = tts_cache_path(text, cache_dir, lang, tld, existing)
+    raw_path = mp3_path.with_name(f"{mp3_path.stem}.f{fade_ms}.v{_PCM_CACHE_VERSION}.raw")
+    if _in_cache(raw_path, existing):
+        return AudioSegment(
+            data=raw_path.read_bytes(), sample_width=2, frame_rate=TARGET_RATE, channels=1
+        )
+    seg = prep_fast(tts_cached(text, cache_dir, lang, tld, existing=existing), fade_ms)
+    # Write-then-rename so an interrupted run never leaves a truncated .raw behind
+    tmp_path = _tmp_path(raw_path)
+    tmp_path.write_bytes(seg.raw_data)
+    tmp_path.replace(raw_path)
+    if existing is not None:
+        existing.add(raw_path.name)
+    return seg
+
+def prefetch_tts(
+    texts: Iterable[str], cache_dir: Path, lang: str = "en", tld: str = "com",
+    workers: int = 8, existing: Optional[Set[str]] = None, progress: bool = True
+) -> None:
+    """Fetch all uncached phrases concurrently so assembly only reads from disk.
+
+    With progress, prints a "progress N/M" line per fetched phrase; the GUI parses these to drive its progress bar.
+    """
+    missing = sorted({
+        t for t in texts if not _in_cache(tts_cache_path(t, cache_dir, lang, tld, existing), existing)
+    })
+    if not missing or workers <= 1:
+        for done, text in enumerate(missing, 1):
+            tts_cached(text, cache_dir, lang, tld, existing=existing)
+            if progress:
+                print(f"progress {done}/{len(missing)}", flush=True)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(tts_cached, t, cache_dir, lang, tld, existing=existing) for t in missing]
+        for done, fut in enumerate(as_completed(futures), 1):
+            fut.result()  # re-raise the first TTS failure instead of swallowing it
+            if progress:
+                print(f"progress {done}/{len(missing)}", flush=True)
 
 @dataclass
 class Settings:
@@ -102,6 +246,7 @@ class Settings:
     fade_ms: int
     outfile: Path
     out_bitrate: str
+    mp3_preset: str  # "cbr" (uses out_bitrate) or "vbr-q0".."vbr-q9"
     lead_in: Optional[str]
     lead_in_gap_ms: int
     rest_text: str
@@ -109,8 +254,9 @@ class Settings:
     end_with: Optional[str]
     mode: str  # "numbers" or "minutes"
     speak_interval: int  # Speak every N minutes (0 = all)
-    speak_at: Optional[List[int]]  # Speak at specific minutes
+    speak_at: Optional[FrozenSet[int]]  # Speak at specific minutes
     minute_text: str  # Text to append (e.g., "minutes remaining")
+    tts_workers: int  # Concurrent gTTS requests when filling the cache
 
 # -----------------------------
 # Assembly
@@ -125,211 +271,185 @@ def should_speak_minute(minute: int, settings: Settings) -> bool:
     else:
         return True  # Speak all minutes
 
-def build_minutes_countdown(settings: Settings, cache_dir: Path) -> Tuple[AudioSegment, List[dict]]:
-    """Build a minutes-based countdown (e.g., '30 minutes remaining')."""
-    cache_dir.mkdir(parents=True, exist_ok=True)
-
-    with tempfile.TemporaryDirectory() as td:
-        tmpdir = Path(td)
-
-        # Precompute assets
-        # Note: Rest prompts are disabled in minutes mode
-        beep = make_beep(settings.beep_freq, settings.beep_ms, settings.beep_gain)
-        end_beep = make_end_beep(settings.beep_freq, settings.beep_ms, settings.beep_gain)
-
-        timeline = []
-        t_ms = 0
-
-        combined = AudioSegment.silent(duration=0, frame_rate=TARGET_RATE)
-
-        # Lead-in
-        if settings.lead_in:
-            lead = prep(tts_cached(settings.lead_in, cache_dir, tmpdir, settings.lang, settings.tld), settings.fade_ms)
-            combined += lead
-            timeline.append({"label": settings.lead_in, "start": t_ms, "end": t_ms + len(lead)})
-            t_ms += len(lead)
-            if settings.lead_in_gap_ms > 0:
-                combined += AudioSegment.silent(duration=settings.lead_in_gap_ms)
-                timeline.append({"label": "lead_gap", "start": t_ms, "end": t_ms + settings.lead_in_gap_ms})
-                t_ms += settings.lead_in_gap_ms
-
-        # Main countdown loop - minutes
-        for i in range(settings.start, 0, -1):
-            # Determine if we should speak this minute
-            if should_speak_minute(i, settings):
-                # Build the spoken text
-                if i == 1:
-                    text = f"1 {settings.minute_text.replace('minutes', 'minute')}" if 'minutes' in settings.minute_text else f"1 {settings.minute_text}"
-                else:
-                    text = f"{i} {settings.minute_text}"
-
-                spoken = prep(tts_cached(text, cache_dir, tmpdir, settings.lang, settings.tld), settings.fade_ms)
-                combined += spoken
-                timeline.append({"label": text, "start": t_ms, "end": t_ms + len(spoken)})
-                t_ms += len(spoken)
-
-            # Add beep after speaking (or at start of silent minute)
-            combined += beep
-            beep_label = f"beep_minute_{i}"
-            timeline.append({"label": beep_label, "start": t_ms, "end": t_ms + len(beep)})
-            t_ms += len(beep)
-
-            # Calculate how much silence we need to make this a full 60-second minute
-            # Account for TTS duration and beep duration
-            elapsed_in_current_minute = len(beep)
-            if should_speak_minute(i, settings):
-                # We need to subtract the TTS duration we already added
-                # Go back and find the TTS segment we just added
-                for segment in reversed(timeline):
-                    if segment["label"].endswith(settings.minute_text):
-                        tts_duration = segment["end"] - segment["start"]
-                        elapsed_in_current_minute += tts_duration
-                        break
-
-            # Fill the rest of the minute with silence
-            # Note: Rest prompts are not used in minutes mode
-            # Each minute should be exactly 60 seconds (60000 ms)
-            remaining_silence = 60000 - elapsed_in_current_minute
-            if remaining_silence > 0:
-                combined += AudioSegment.silent(duration=remaining_silence)
-                timeline.append({"label": f"silence_minute_{i}", "start": t_ms, "end": t_ms + remaining_silence})
-                t_ms += remaining_silence
-
-            # After completing the last minute, add distinctive end beep and message
-            if i == 1:
-                # Add distinctive end beep
-                combined += end_beep
-                timeline.append({
-                    "label": "end_beep",
-                    "start": t_ms,
-                    "end": t_ms + len(end_beep)
-                })
-                t_ms += len(end_beep)
-
-                # Add end message if specified
-                if settings.end_with:
-                    end_seg = prep(
-                        tts_cached(settings.end_with, cache_dir, tmpdir, settings.lang, settings.tld),
-                        settings.fade_ms
-                    )
-                    combined += end_seg
-                    timeline.append({
-                        "label": settings.end_with,
-                        "start": t_ms,
-                        "end": t_ms + len(end_seg)
-                    })
-                    t_ms += len(end_seg)
-
-        return combined, timeline
+def minute_phrase(minute: int, settings: Settings) -> str:
+    """Spoken text for a minute, singular for the last one ("1 minute remaining")."""
+    if minute == 1:
+        return f"1 {settings.minute_text.replace('minutes', 'minute')}" if 'minutes' in settings.minute_text else f"1 {settings.minute_text}"
+    return f"{minute} {settings.minute_text}"
 
-def build_countdown_audio(settings: Settings, cache_dir: Path) -> Tuple[AudioSegment, List[dict]]:
+def _prepped_tts(settings: Settings, cache_dir: Path, phrases: Iterable[str]) -> Callable[[str], AudioSegment]:
+    """Prefetch `phrases`, then return a per-build lookup that decodes and preps each phrase only once."""
     cache_dir.mkdir(parents=True, exist_ok=True)
-
-    with tempfile.TemporaryDirectory() as td:
-        tmpdir = Path(td)
-
-        # Precompute assets
-        rest_seg = prep(tts_cached(settings.rest_text, cache_dir, tmpdir, settings.lang, settings.tld), settings.fade_ms)
-        beep = make_beep(settings.beep_freq, settings.beep_ms, settings.beep_gain)
-        end_beep = make_end_beep(settings.beep_freq, settings.beep_ms, settings.beep_gain)
-
-        timeline = []
-        t_ms = 0
-        skipped_rests = 0  # NEW
-
-        combined = AudioSegment.silent(duration=0, frame_rate=TARGET_RATE)
-
-        # Lead-in
-        if settings.lead_in:
-            lead = prep(tts_cached(settings.lead_in, cache_dir, tmpdir, settings.lang, settings.tld), settings.fade_ms)
-            combined += lead
-            timeline.append({"label": settings.lead_in, "start": t_ms, "end": t_ms + len(lead)})
-            t_ms += len(lead)
-            if settings.lead_in_gap_ms > 0:
-                combined += AudioSegment.silent(duration=settings.lead_in_gap_ms)
-                timeline.append({"label": "lead_gap", "start": t_ms, "end": t_ms + settings.lead_in_gap_ms})
-                t_ms += settings.lead_in_gap_ms
-
-                # Main loop
-        for i in range(settings.start, 0, -1):
-            spoken = prep(tts_cached(str(i), cache_dir, tmpdir, settings.lang, settings.tld), settings.fade_ms)
-            combined += spoken
-            timeline.append({"label": str(i), "start": t_ms, "end": t_ms + len(spoken)})
-            t_ms += len(spoken)
-
-            if i == 1:
-                # After final "1" - add distinctive end beep
-                combined += end_beep
-                timeline.append({
-                    "label": "end_beep",
-                    "start": t_ms,
-                    "end": t_ms + len(end_beep)
-                })
-                t_ms += len(end_beep)
-
-                # Add end message if specified
-                if settings.end_with:
-                    end_seg = prep(
-                        tts_cached(settings.end_with, cache_dir, tmpdir, settings.lang, settings.tld),
-                        settings.fade_ms
-                    )
-                    combined += end_seg
-                    timeline.append({
-                        "label": settings.end_with,
-                        "start": t_ms,
-                        "end": t_ms + len(end_seg)
-                    })
-                    t_ms += len(end_seg)
-                break
-
-
-            # Determine rest vs normal
-            if settings.every_n > 0 and (i % settings.every_n == 0):
-                if skipped_rests < settings.skip_first_rest:
-                    skipped_rests += 1
-                    # behave like normal interval
-                    combined += beep
-                    timeline.append({"label": "beep_skip_rest", "start": t_ms, "end": t_ms + len(beep)})
-                    t_ms += len(beep)
-
-                    gap_ms = int(settings.interval * 1000)
-                    combined += AudioSegment.silent(duration=gap_ms)
-                    timeline.append({"label": "pause_skip_rest", "start": t_ms, "end": t_ms + gap_ms})
-                    t_ms += gap_ms
-                else:
-                    # Normal rest cue
-                    combined += rest_seg
-                    timeline.append({"label": settings.rest_text, "start": t_ms, "end": t_ms + len(rest_seg)})
-                    t_ms += len(rest_seg)
-
-                    combined += beep
-                    timeline.append({"label": "beep", "start": t_ms, "end": t_ms + len(beep)})
-                    t_ms += len(beep)
-
-                    gap_ms = int(settings.long_interval * 1000)
-                    combined += AudioSegment.silent(duration=gap_ms)
-                    timeline.append({"label": "pause_long", "start": t_ms, "end": t_ms + gap_ms})
-                    t_ms += gap_ms
+    existing = list_cache(cache_dir)
+    prefetch_tts(phrases, cache_dir, settings.lang, settings.tld, settings.tts_workers, existing)
+
+    @lru_cache(maxsize=None)
+    def prepped(text: str) -> AudioSegment:
+        return tts_prepped_cached(text, cache_dir, settings.lang, settings.tld, settings.fade_ms, existing)
+    return prepped
+
+class Tick(NamedTuple):
+    """One cue in the countdown: a labeled sound, optionally followed by a labeled silence."""
+    label: str
+    seg: AudioSegment
+    gap_ms: int = 0
+    gap_label: Optional[str] = None  # None = no gap entry at all
+
+def _build_timeline(labels: List[str], durs: List[int]) -> List[dict]:
+    """Turn parallel label/duration lists into start/end cue dicts in one pass."""
+    ends = np.cumsum(durs, dtype=np.int64)
+    starts = ends - np.asarray(durs, dtype=np.int64)
+    return [
+        {"label": label, "start": int(start), "end": int(end)}
+        for label, start, end in zip(labels, starts, ends)
+    ]
+
+def _assemble(ticks: Iterable[Tick]) -> Tuple[AudioSegment, List[dict]]:
+    """Lay ticks out on one track and build the matching timeline."""
+    # Silence is never materialized; gaps just advance the track cursor
+    track = _Track()
+    # Timeline is kept as parallel lists and turned into cue dicts at the end
+    labels: List[str] = []
+    durs: List[int] = []
+
+    for tick in ticks:
+        track.add(tick.seg)
+        labels.append(tick.label)
+        durs.append(len(tick.seg))
+        if tick.gap_label is not None:
+            track.skip(tick.gap_ms)
+            labels.append(tick.gap_label)
+            durs.append(tick.gap_ms)
+
+    return track.render(), _build_timeline(labels, durs)
+
+def _lead_in_tick(settings: Settings, prepped: Callable[[str], AudioSegment]) -> Tick:
+    gap_label = "lead_gap" if settings.lead_in_gap_ms > 0 else None
+    return Tick(settings.lead_in, prepped(settings.lead_in), settings.lead_in_gap_ms, gap_label)
+
+def _iter_ticks_minutes(
+    settings: Settings, prepped: Callable[[str], AudioSegment], speak_set: Set[int]
+) -> Iterator[Tick]:
+    # Precompute assets
+    # Note: Rest prompts are disabled in minutes mode
+    end_seg = prepped(settings.end_with) if settings.end_with else None
+    beep = make_beep(settings.beep_freq, settings.beep_ms, settings.beep_gain)
+    end_beep = make_end_beep(settings.beep_freq, settings.beep_ms, settings.beep_gain)
+
+    # Duration of the most recent cue ending in minute_text, used to pad each minute
+    last_phrase_ms = None
+
+    # Lead-in
+    if settings.lead_in:
+        lead = _lead_in_tick(settings, prepped)
+        if lead.label.endswith(settings.minute_text):
+            last_phrase_ms = len(lead.seg)
+        yield lead
+
+    # Main countdown loop - minutes
+    for i in range(settings.start, 0, -1):
+        # Account for TTS duration and beep duration
+        elapsed_in_current_minute = len(beep)
+
+        # Determine if we should speak this minute
+        if i in speak_set:
+            text = minute_phrase(i, settings)
+            spoken = prepped(text)
+            if text.endswith(settings.minute_text):
+                last_phrase_ms = len(spoken)
+            if last_phrase_ms is not None:
+                elapsed_in_current_minute += last_phrase_ms
+            yield Tick(text, spoken)
+
+        # Beep after speaking (or at start of silent minute), then fill the rest of the
+        # minute with silence. Each minute should be exactly 60 seconds (60000 ms)
+        remaining_silence = 60000 - elapsed_in_current_minute
+        gap_label = f"silence_minute_{i}" if remaining_silence > 0 else None
+        yield Tick(f"beep_minute_{i}", beep, remaining_silence, gap_label)
+
+    # After completing the last minute, add distinctive end beep and message
+    if settings.start >= 1:
+        yield Tick("end_beep", end_beep)
+        if end_seg is not None:
+            yield Tick(settings.end_with, end_seg)
+
+def _iter_ticks_numbers(settings: Settings, prepped: Callable[[str], AudioSegment]) -> Iterator[Tick]:
+    # Precompute assets
+    rest_seg = prepped(settings.rest_text)
+    end_seg = prepped(settings.end_with) if settings.end_with else None
+    beep = make_beep(settings.beep_freq, settings.beep_ms, settings.beep_gain)
+    end_beep = make_end_beep(settings.beep_freq, settings.beep_ms, settings.beep_gain)
+
+    short_ms = int(settings.interval * 1000)
+    long_ms = int(settings.long_interval * 1000)
+    skipped_rests = 0
+
+    # Lead-in
+    if settings.lead_in:
+        yield _lead_in_tick(settings, prepped)
+
+    # Main loop; the final "1" is handled after it
+    for i in range(settings.start, 1, -1):
+        yield Tick(str(i), prepped(str(i)))
+
+        # Determine rest vs normal
+        if settings.every_n > 0 and (i % settings.every_n == 0):
+            if skipped_rests < settings.skip_first_rest:
+                skipped_rests += 1
+                # behave like normal interval
+                yield Tick("beep_skip_rest", beep, short_ms, "pause_skip_rest")
             else:
-                # normal step
-                combined += beep
-                timeline.append({"label": "beep", "start": t_ms, "end": t_ms + len(beep)})
-                t_ms += len(beep)
+                # Normal rest cue
+                yield Tick(settings.rest_text, rest_seg)
+                yield Tick("beep", beep, long_ms, "pause_long")
+        else:
+            # normal step
+            yield Tick("beep", beep, short_ms, "pause")
+
+    if settings.start >= 1:
+        yield Tick("1", prepped("1"))
+        # After final "1" - add distinctive end beep
+        yield Tick("end_beep", end_beep)
+        # Add end message if specified
+        if end_seg is not None:
+            yield Tick(settings.end_with, end_seg)
+
+def _spoken_minutes(settings: Settings) -> Set[int]:
+    return {m for m in range(1, settings.start + 1) if should_speak_minute(m, settings)}
+
+def tts_phrases(settings: Settings) -> List[str]:
+    """Every phrase a build with these settings will speak."""
+    if settings.mode == "minutes":
+        phrases = [minute_phrase(i, settings) for i in _spoken_minutes(settings)]
+        extra = [settings.lead_in, settings.end_with]
+    else:
+        phrases = [str(i) for i in range(settings.start, 0, -1)]
+        extra = [settings.rest_text, settings.lead_in, settings.end_with]
+    return phrases + [t for t in extra if t]
 
-                gap_ms = int(settings.interval * 1000)
-                combined += AudioSegment.silent(duration=gap_ms)
-                timeline.append({"label": "pause", "start": t_ms, "end": t_ms + gap_ms})
-                t_ms += gap_ms
-                
-                
+def build_minutes_countdown(settings: Settings, cache_dir: Path) -> Tuple[AudioSegment, List[dict]]:
+    """Build a minutes-based countdown (e.g., '30 minutes remaining')."""
+    prepped = _prepped_tts(settings, cache_dir, tts_phrases(settings))
+    return _assemble(_iter_ticks_minutes(settings, prepped, _spoken_minutes(settings)))
 
-        return combined, timeline
+def build_countdown_audio(settings: Settings, cache_dir: Path) -> Tuple[AudioSegment, List[dict]]:
+    prepped = _prepped_tts(settings, cache_dir, tts_phrases(settings))
+    return _assemble(_iter_ticks_numbers(settings, prepped))
+
+def export_mp3(audio: AudioSegment, outfile: Path, preset: str = "cbr", bitrate: str = "192k") -> None:
+    """Encode with LAME, either CBR at `bitrate` or VBR for a "vbr-qN" preset."""
+    params = ["-threads", "0"]
+    if preset.startswith("vbr-q"):
+        params += ["-q:a", preset[len("vbr-q"):]]
+        audio.export(str(outfile), format="mp3", codec="libmp3lame", parameters=params)
+    else:
+        audio.export(str(outfile), format="mp3", codec="libmp3lame", bitrate=bitrate, parameters=params)
 
 # -----------------------------
 # CLI
 # -----------------------------
 
-def parse_args(argv: Optional[List[str]] = None) -> Settings:
+def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Build a voiced countdown with beeps and rest prompts.")
     p.add_argument("--start", type=int, default=80, help="Starting number for countdown (reps or minutes depending on mode).")
     p.add_argument("--mode", choices=["numbers", "minutes"], default="numbers", help="Countdown mode: 'numbers' (default) or 'minutes'.")
@@ -347,19 +467,25 @@ def parse_args(argv: Optional[List[str]] = None) -> Settings:
     p.add_argument("--fade-ms", type=int, default=12, help="Fade in/out per segment to avoid clicks.")
     p.add_argument("--outfile", default="countdown_combined.mp3", help="Output MP3 file path.")
     p.add_argument("--out-bitrate", default="192k", help="MP3 bitrate, e.g. 128k, 192k, 256k.")
+    p.add_argument("--mp3-preset", choices=["cbr"] + [f"vbr-q{q}" for q in range(10)], default="cbr",
+                   help="MP3 encoding: 'cbr' at --out-bitrate, or LAME VBR quality vbr-q0 (best) .. vbr-q9 (smallest). VBR encodes faster.")
     p.add_argument("--lead-in", default=None, help="Optional spoken lead-in line (e.g., 'Get ready').")
     p.add_argument("--lead-in-gap-ms", type=int, default=1000, help="Silence after lead-in (ms).")
     p.add_argument("--rest-text", default="rest", help="Word to speak at rest cues.")
     p.add_argument("--skip-first-rest", type=int, default=0, help="Number of initial rest periods to skip.")
     p.add_argument("--end-with", default=None, help="Optional spoken phrase to play at the very end (e.g., 'Good Job!').")
+    p.add_argument("--tts-workers", type=int, default=8, help="Parallel gTTS requests for uncached phrases (1 = sequential).")
+    p.add_argument("--stdin-json", action="store_true",
+                   help="Read all settings as one JSON object from stdin (keys like 'long_interval'); other flags are ignored.")
 
-    args = p.parse_args(argv)
+    return p
 
+def _to_settings(args: argparse.Namespace) -> Settings:
     # Parse speak_at if provided
-    speak_at_list = None
+    speak_at_set = None
     if args.speak_at:
         try:
-            speak_at_list = [int(x.strip()) for x in args.speak_at.split(',')]
+            speak_at_set = frozenset(int(x.strip()) for x in args.speak_at.split(','))
         except ValueError:
             raise ValueError("--speak-at must be comma-separated integers (e.g., '30,15,10,5,1')")
 
@@ -376,6 +502,7 @@ def parse_args(argv: Optional[List[str]] = None) -> Settings:
         fade_ms=args.fade_ms,
         outfile=Path(args.outfile),
         out_bitrate=args.out_bitrate,
+        mp3_preset=args.mp3_preset,
         lead_in=args.lead_in,
         lead_in_gap_ms=args.lead_in_gap_ms,
         rest_text=args.rest_text,
@@ -383,20 +510,57 @@ def parse_args(argv: Optional[List[str]] = None) -> Settings:
         end_with=args.end_with,
         mode=args.mode,
         speak_interval=args.speak_interval,
-        speak_at=speak_at_list,
-        minute_text=args.minute_text
+        speak_at=speak_at_set,
+        minute_text=args.minute_text,
+        tts_workers=args.tts_workers
     )
 
-def main(argv: Optional[List[str]] = None) -> int:
-    settings = parse_args(argv)
-
-    try:
-        _ = AudioSegment.silent(duration=10, frame_rate=TARGET_RATE)
-    except Exception as e:
-        print("pydub/ffmpeg not ready: ", e, file=sys.stderr)
-        return 2
-
-    cache_dir = Path("tts_cache")
+def parse_args(argv: Optional[List[str]] = None) -> Settings:
+    p = _build_parser()
+    args = p.parse_args(argv)
+    if args.stdin_json:
+        try:
+            return settings_from_params(json.load(sys.stdin))
+        except ValueError as e:  # includes malformed JSON
+            p.error(f"--stdin-json: {e}")
+    return _to_settings(args)
+
+def settings_from_params(params: dict) -> Settings:
+    """Settings from a dict keyed like the CLI dests (e.g. 'long_interval'); missing keys take CLI defaults.
+
+    Values go through the same type/choices checks as the flags; 'speak_at' may also be a list of ints.
+    Raises ValueError for unknown keys or bad values.
+    """
+    if not isinstance(params, dict):
+        raise ValueError("expected a JSON object of settings")
+    p = _build_parser()
+    args = p.parse_args([])
+    actions = {a.dest: a for a in p._actions if a.dest not in ("help", "stdin_json")}
+    for name, value in params.items():
+        action = actions.get(name)
+        if action is None:
+            raise ValueError(f"Unknown parameter: {name}")
+        if value is None and action.default is None:
+            setattr(args, name, None)
+            continue
+        if name == "speak_at" and isinstance(value, list):
+            value = ",".join(str(v) for v in value)
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f"{name}: expected a string or number, got {type(value).__name__}")
+        if action.type is not None:
+            try:
+                value = action.type(str(value))
+            except ValueError:
+                raise ValueError(f"{name}: invalid {action.type.__name__} value: {value!r}")
+        else:
+            value = str(value)
+        if action.choices is not None and value not in action.choices:
+            raise ValueError(f"{name}: invalid choice: {value!r} (choose from {', '.join(action.choices)})")
+        setattr(args, name, value)
+    return _to_settings(args)
+
+def generate(settings: Settings, cache_dir: Path = Path("tts_cache")) -> Path:
+    """Build the countdown, write the MP3 and timeline JSON, and return the MP3 path."""
     cache_dir.mkdir(exist_ok=True, parents=True)
 
     # Choose builder based on mode
@@ -407,21 +571,45 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"Building {settings.start}-count countdown...")
         audio, timeline = build_countdown_audio(settings, cache_dir)
 
-    # Export WAV then MP3 once
-    with tempfile.TemporaryDirectory() as td:
-        tmp_wav = Path(td) / "combined.wav"
-        audio.export(str(tmp_wav), format="wav")
-        final = AudioSegment.from_wav(str(tmp_wav))
-        settings.outfile.parent.mkdir(parents=True, exist_ok=True)
-        final.export(str(settings.outfile), format="mp3", bitrate=settings.out_bitrate)
+    # Encode straight to MP3; pydub pipes the PCM to ffmpeg itself
+    settings.outfile.parent.mkdir(parents=True, exist_ok=True)
+    export_mp3(audio, settings.outfile, settings.mp3_preset, settings.out_bitrate)
 
-    # Save timeline JSON
+    # Save timeline JSON (compact; orjson when available)
     timeline_path = settings.outfile.with_suffix(".json")
-    with open(timeline_path, "w", encoding="utf-8") as f:
-        json.dump(timeline, f, indent=2)
+    if orjson is not None:
+        timeline_path.write_bytes(orjson.dumps(timeline))
+    else:
+        timeline_path.write_text(json.dumps(timeline, separators=(",", ":"), ensure_ascii=False), encoding="utf-8")
 
     print(f"Wrote: {settings.outfile}")
     print(f"Wrote: {timeline_path}")
+    return settings.outfile
+
+def build(params: dict, cache_dir: Path = Path("tts_cache")) -> Path:
+    """In-process entry point for the GUI/web front-ends: params as in settings_from_params()."""
+    return generate(settings_from_params(params), cache_dir)
+
+def prewarm(params: dict, cache_dir: Path = Path("tts_cache")) -> None:
+    """Fetch every phrase `build(params)` would need into the cache, without building audio.
+
+    Prints nothing, so it can run alongside a build whose output is being captured.
+    """
+    settings = settings_from_params(params)
+    cache_dir.mkdir(exist_ok=True, parents=True)
+    prefetch_tts(tts_phrases(settings), cache_dir, settings.lang, settings.tld,
+                 settings.tts_workers, list_cache(cache_dir), progress=False)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = parse_args(argv)
+
+    try:
+        _ = AudioSegment.silent(duration=10, frame_rate=TARGET_RATE)
+    except Exception as e:
+        print("pydub/ffmpeg not ready: ", e, file=sys.stderr)
+        return 2
+
+    generate(settings)
     print("Tip: caches in ./tts_cache (delete to refresh voices).")
     return 0
 
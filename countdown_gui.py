@@ -14,22 +14,84 @@ import sys
 from pathlib import Path
 import os
 import json
+import io
+import queue
+import re
+import contextlib
+from functools import partial
+
+import countdown_builder as cb
+
+try:
+    import orjson
+except ImportError:  # optional speedup for preset files
+    orjson = None
+
+# Anything that can still become a float while typing: "", "-", "3.", "-.5", ...
+_FLOAT_PREFIX = re.compile(r"-?\d*\.?\d*")
+
+class _QueueWriter(io.TextIOBase):
+    """stdout stand-in that hands complete lines to a queue for the Tk thread"""
+    
+    def __init__(self, q):
+        self._q = q
+        self._buf = ""
+    
+    def write(self, s):
+        self._buf += s
+        *lines, self._buf = self._buf.split("\n")
+        for line in lines:
+            self._q.put(line)
+        return len(s)
 
 class CountdownGUI:
+    # Fixed settings-row pitch so the visible range and scrollregion follow from arithmetic alone
+    ROW_H = 34
+    ROW_PADX = 20
+    WHEEL_STEP = 10  # pixels per mousewheel unit
+    NUMERIC_FIELDS = ('start', 'interval', 'long_interval', 'every_n', 'skip_first_rest', 'beep_freq', 'beep_ms',
+                      'beep_gain', 'fade_ms', 'lead_in_gap_ms', 'tts_workers')
+    FLOAT_FIELDS = frozenset({'interval', 'long_interval', 'beep_gain'})
+    WIDE_FIELDS = frozenset({'outfile', 'lang', 'tld', 'lead_in', 'lead_in_gap_ms', 'rest_text', 'end_with'})
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Countdown Audio Builder")
         self.root.geometry("800x700")
         
+        # Shared TTS cache so voices survive across working directories and runs
+        self.cache_dir = Path.home() / ".countdown_cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Held by a preset prewarm; Generate waits on it so the two never fetch the same phrase
+        self._cache_lock = threading.Lock()
+        
+        # System command for opening the generated file (None: os.startfile or manual)
+        if sys.platform.startswith('linux'):
+            self._opener = ['xdg-open']
+        elif sys.platform.startswith('darwin'):  # macOS
+            self._opener = ['open']
+        else:
+            self._opener = None
+        
+        # Pending after_idle row refresh per settings canvas
+        self._refresh_tokens = {}
+        
         # Variables for form fields
         self.vars = {}
         self.init_variables()
         
+        # Status for generation process
+        self.is_generating = False
+        self._output_q = queue.Queue()
+        self._last_params = {}
+        self._input_error = None
+        
         # Create the UI
         self.create_widgets()
         
-        # Status for generation process
-        self.is_generating = False
+        # Validate as the user types so Generate is only clickable with usable input
+        for name in self.NUMERIC_FIELDS:
+            self.vars[name].trace_add("write", self._revalidate)
         
     def init_variables(self):
         """Initialize tkinter variables for all parameters"""
@@ -46,6 +108,7 @@ class CountdownGUI:
             'fade_ms': tk.IntVar(value=12),
             'outfile': tk.StringVar(value="countdown_combined.mp3"),
             'out_bitrate': tk.StringVar(value="192k"),
+            'tts_workers': tk.IntVar(value=8),
             'lead_in': tk.StringVar(value=""),
             'lead_in_gap_ms': tk.IntVar(value=1000),
             'rest_text': tk.StringVar(value="rest"),
@@ -55,8 +118,25 @@ class CountdownGUI:
     
     def create_widgets(self):
         """Create and layout all GUI widgets"""
-        # Main frame with scrollable canvas
-        main_frame = ttk.Frame(self.root)
+        # Keep the window hidden until layout is final, so it is computed once rather than per widget
+        self.root.withdraw()
+        
+        # Shared style for the grey tooltip labels, configured once instead of per row
+        style = ttk.Style()
+        style.configure("Tooltip.TLabel", foreground="gray")
+        
+        # Keystroke filters for numeric entries (Tcl %P = the text if the edit is allowed)
+        self._vcmd_int = (self.root.register(self._is_int_prefix), "%P")
+        self._vcmd_float = (self.root.register(self._is_float_prefix), "%P")
+        
+        # One wheel binding for all tabs; the handler finds the canvas under the pointer
+        self._scroll_canvases = set()
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.root.bind_all(sequence, self._on_mousewheel)
+        
+        # Main frame with scrollable canvas; fixed to the window size so packing children never resizes it
+        main_frame = ttk.Frame(self.root, width=780, height=680)
+        main_frame.pack_propagate(False)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Create notebook for organized tabs
@@ -68,28 +148,36 @@ class CountdownGUI:
         notebook.add(basic_frame, text="Basic Settings")
         self.create_basic_settings(basic_frame)
         
-        # Advanced Settings Tab
+        # Advanced Settings Tab (filled in on first visit)
         advanced_frame = ttk.Frame(notebook)
         notebook.add(advanced_frame, text="Advanced Settings")
-        self.create_advanced_settings(advanced_frame)
         
-        # Audio Settings Tab
+        # Audio Settings Tab (filled in on first visit)
         audio_frame = ttk.Frame(notebook)
         notebook.add(audio_frame, text="Audio Settings")
-        self.create_audio_settings(audio_frame)
+        
+        self._tab_builders = {
+            str(advanced_frame): (advanced_frame, self.create_advanced_settings),
+            str(audio_frame): (audio_frame, self.create_audio_settings),
+        }
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
         # Control buttons frame
         control_frame = ttk.Frame(main_frame)
         control_frame.pack(fill=tk.X, pady=(10, 0))
         
-        # Progress bar
-        self.progress = ttk.Progressbar(control_frame, mode='indeterminate')
+        # Progress bar, driven by the builder's "progress N/M" lines (no animation timer)
+        self.progress = ttk.Progressbar(control_frame, mode='determinate', maximum=100)
         self.progress.pack(fill=tk.X, pady=(0, 10))
         
         # Status label
         self.status_label = ttk.Label(control_frame, text="Ready to generate countdown")
         self.status_label.pack(pady=(0, 10))
         
+        # Builder output, streamed in while generating
+        self.log = tk.Text(control_frame, height=5, state=tk.DISABLED)
+        self.log.pack(fill=tk.X, pady=(0, 10))
+        
         # Buttons
         button_frame = ttk.Frame(control_frame)
         button_frame.pack(fill=tk.X)
@@ -105,6 +193,16 @@ class CountdownGUI:
         
         self.load_preset_btn = ttk.Button(button_frame, text="Load Preset", command=self.load_preset)
         self.load_preset_btn.pack(side=tk.LEFT)
+        
+        self.root.update_idletasks()
+        self.root.deiconify()
+    
+    def _on_tab_changed(self, event):
+        """Build a lazily-created tab the first time it is selected"""
+        entry = self._tab_builders.pop(str(event.widget.select()), None)
+        if entry is not None:
+            frame, builder = entry
+            builder(frame)
     
     def create_basic_settings(self, parent):
         """Create basic settings widgets"""
@@ -112,19 +210,6 @@ class CountdownGUI:
         title = ttk.Label(parent, text="Basic Countdown Settings", font=('TkDefaultFont', 12, 'bold'))
         title.pack(pady=(0, 15))
         
-        # Create scrollable frame
-        canvas = tk.Canvas(parent)
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
         # Basic settings
         settings = [
             ("Starting Number:", 'start', "Number to start countdown from"),
@@ -134,51 +219,13 @@ class CountdownGUI:
             ("Skip First N Rests:", 'skip_first_rest', "Number of initial rest periods to skip"),
             ("Output File:", 'outfile', "Name of the output MP3 file"),
         ]
-        
-        for i, (label, var_name, tooltip) in enumerate(settings):
-            frame = ttk.Frame(scrollable_frame)
-            frame.pack(fill=tk.X, pady=5, padx=20)
-            
-            ttk.Label(frame, text=label, width=25).pack(side=tk.LEFT)
-            
-            if var_name == 'outfile':
-                file_frame = ttk.Frame(frame)
-                file_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
-                
-                entry = ttk.Entry(file_frame, textvariable=self.vars[var_name], width=30)
-                entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-                
-                browse_btn = ttk.Button(file_frame, text="Browse", 
-                                      command=lambda: self.browse_output_file())
-                browse_btn.pack(side=tk.LEFT, padx=(5, 0))
-            else:
-                entry = ttk.Entry(frame, textvariable=self.vars[var_name], width=15)
-                entry.pack(side=tk.LEFT)
-            
-            # Tooltip
-            ttk.Label(frame, text=f"({tooltip})", foreground="gray").pack(side=tk.LEFT, padx=(10, 0))
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self._build_scroll_tab(parent, settings)
     
     def create_advanced_settings(self, parent):
         """Create advanced settings widgets"""
         title = ttk.Label(parent, text="Text and Language Settings", font=('TkDefaultFont', 12, 'bold'))
         title.pack(pady=(0, 15))
         
-        # Create scrollable frame
-        canvas = tk.Canvas(parent)
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
         settings = [
             ("Language Code:", 'lang', "gTTS language (en, es, fr, etc.)"),
             ("TLD Region:", 'tld', "Voice region (com, co.uk, com.au, etc.)"),
@@ -187,64 +234,157 @@ class CountdownGUI:
             ("Rest Text:", 'rest_text', "Word spoken during rest cues"),
             ("End Text:", 'end_with', "Optional closing phrase (e.g., 'Good job!')"),
         ]
-        
-        for label, var_name, tooltip in settings:
-            frame = ttk.Frame(scrollable_frame)
-            frame.pack(fill=tk.X, pady=5, padx=20)
-            
-            ttk.Label(frame, text=label, width=25).pack(side=tk.LEFT)
-            entry = ttk.Entry(frame, textvariable=self.vars[var_name], width=30)
-            entry.pack(side=tk.LEFT)
-            
-            ttk.Label(frame, text=f"({tooltip})", foreground="gray").pack(side=tk.LEFT, padx=(10, 0))
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self._build_scroll_tab(parent, settings)
     
     def create_audio_settings(self, parent):
         """Create audio settings widgets"""
         title = ttk.Label(parent, text="Audio Processing Settings", font=('TkDefaultFont', 12, 'bold'))
         title.pack(pady=(0, 15))
         
-        # Create scrollable frame
-        canvas = tk.Canvas(parent)
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
         settings = [
             ("Beep Frequency (Hz):", 'beep_freq', "Frequency of beep tones"),
             ("Beep Duration (ms):", 'beep_ms', "Length of each beep"),
             ("Beep Gain (dB):", 'beep_gain', "Volume of beeps (negative = quieter)"),
             ("Fade Duration (ms):", 'fade_ms', "Fade in/out to avoid clicks"),
             ("Output Bitrate:", 'out_bitrate', "MP3 bitrate (128k, 192k, 256k, etc.)"),
+            ("TTS Download Workers:", 'tts_workers', "Parallel gTTS requests on a cold cache"),
         ]
-        
-        for label, var_name, tooltip in settings:
-            frame = ttk.Frame(scrollable_frame)
-            frame.pack(fill=tk.X, pady=5, padx=20)
-            
-            ttk.Label(frame, text=label, width=25).pack(side=tk.LEFT)
-            
-            if var_name == 'out_bitrate':
-                combo = ttk.Combobox(frame, textvariable=self.vars[var_name], 
-                                   values=['128k', '192k', '256k', '320k'], width=10)
-                combo.pack(side=tk.LEFT)
-            else:
-                entry = ttk.Entry(frame, textvariable=self.vars[var_name], width=15)
-                entry.pack(side=tk.LEFT)
-            
-            ttk.Label(frame, text=f"({tooltip})", foreground="gray").pack(side=tk.LEFT, padx=(10, 0))
+        self._build_scroll_tab(parent, settings)
+    
+    def _build_scroll_tab(self, parent, settings):
+        """Scrollable canvas + scrollbar for a tab; rows sit at fixed offsets and only rows in view get widgets"""
+        canvas = tk.Canvas(parent)
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
+        canvas.configure(yscrollcommand=partial(self._on_yscroll, canvas, scrollbar))
+        
+        # One tooltip line per tab, filled in while the pointer is over a row
+        canvas._tip = ttk.Label(parent, text="", style="Tooltip.TLabel")
+        canvas._tip.pack(side="bottom", fill="x", padx=self.ROW_PADX, pady=(5, 0))
+        
+        canvas._settings = settings
+        canvas._rows = {}  # row index -> (canvas window items, widgets) for that row
+        canvas._cached_size = (0, 0)
+        # Every row is ROW_H tall, so the content height is known without asking Tk for a bbox
+        canvas._content_h = len(settings) * self.ROW_H
+        canvas.configure(scrollregion=(0, 0, 0, canvas._content_h))
+        canvas.bind("<Configure>", self._on_canvas_configure)
+        canvas.configure(yscrollincrement=self.WHEEL_STEP)
+        self._scroll_canvases.add(canvas)
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
+        return canvas
+    
+    def _on_mousewheel(self, event):
+        """Scroll whichever settings canvas is under the pointer, in small fixed steps"""
+        try:
+            widget = self.root.winfo_containing(event.x_root, event.y_root)
+        except KeyError:  # Tk-internal windows such as a Combobox popdown have no Python wrapper
+            return
+        while widget is not None and widget not in self._scroll_canvases:
+            widget = widget.master
+        if widget is None:
+            return
+        
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            # Windows reports multiples of 120 per notch, macOS small raw deltas
+            step = -max(1, abs(event.delta) // 40) if event.delta > 0 else max(1, abs(event.delta) // 40)
+        widget.yview_scroll(step, "units")
+    
+    def _on_canvas_configure(self, event):
+        # Configure also fires for moves and border changes; only a new size can change the visible rows
+        size = (event.width, event.height)
+        canvas = event.widget
+        if size != canvas._cached_size:
+            canvas._cached_size = size
+            canvas.configure(scrollregion=(0, 0, event.width, canvas._content_h))
+            self._schedule_refresh(canvas)
+    
+    def _on_yscroll(self, canvas, scrollbar, first, last):
+        scrollbar.set(first, last)
+        self._schedule_refresh(canvas)
+    
+    def _schedule_refresh(self, canvas):
+        """Coalesce bursts of resize/scroll events into one row refresh per idle tick"""
+        token = self._refresh_tokens.pop(canvas, None)
+        if token is not None:
+            self.root.after_cancel(token)
+        self._refresh_tokens[canvas] = self.root.after_idle(self._refresh_rows, canvas)
+    
+    def _refresh_rows(self, canvas):
+        """Create rows that scrolled into view and destroy the ones that left it"""
+        self._refresh_tokens.pop(canvas, None)
+        first = max(0, int(canvas.canvasy(0) // self.ROW_H))
+        last = min(len(canvas._settings), first + canvas.winfo_height() // self.ROW_H + 2)
+        rows = canvas._rows
+        
+        for i in [i for i in rows if not first <= i < last]:
+            items, widgets = rows.pop(i)
+            for item in items:
+                canvas.delete(item)
+            for widget in widgets:
+                widget.destroy()
+        
+        for i in range(first, last):
+            if i not in rows:
+                rows[i] = self._make_row(canvas, i, *canvas._settings[i])
+    
+    def _make_row(self, canvas, i, label, var_name, tooltip):
+        """Place one label/input row straight onto the canvas (no row frame); all state lives in self.vars"""
+        y = i * self.ROW_H + self.ROW_H // 2
+        
+        name_label = ttk.Label(canvas, text=label, width=25)
+        
+        if var_name == 'out_bitrate':
+            field = ttk.Combobox(canvas, textvariable=self.vars[var_name], 
+                               values=['128k', '192k', '256k', '320k'], width=10)
+        elif var_name in self.FLOAT_FIELDS:
+            field = ttk.Entry(canvas, textvariable=self.vars[var_name], width=15,
+                              validate='key', validatecommand=self._vcmd_float)
+        elif var_name in self.NUMERIC_FIELDS:
+            field = ttk.Entry(canvas, textvariable=self.vars[var_name], width=15,
+                              validate='key', validatecommand=self._vcmd_int)
+        else:
+            width = 30 if var_name in self.WIDE_FIELDS else 15
+            field = ttk.Entry(canvas, textvariable=self.vars[var_name], width=width)
+        
+        # Fixed-width label column, so every row's field lines up at the same x
+        field_x = self.ROW_PADX + name_label.winfo_reqwidth()
+        items = [
+            canvas.create_window((self.ROW_PADX, y), window=name_label, anchor="w"),
+            canvas.create_window((field_x, y), window=field, anchor="w"),
+        ]
+        widgets = [name_label, field]
+        
+        if var_name == 'outfile':
+            browse_btn = ttk.Button(canvas, text="Browse", command=self.browse_output_file)
+            items.append(canvas.create_window((field_x + field.winfo_reqwidth() + 5, y), window=browse_btn, anchor="w"))
+            widgets.append(browse_btn)
+        
+        # Tooltip goes to the tab's shared label on hover
+        for widget in (name_label, field):
+            widget._tooltip = tooltip
+            widget.bind("<Enter>", self._show_tip)
+            widget.bind("<Leave>", self._hide_tip)
+        return items, widgets
+    
+    @staticmethod
+    def _is_int_prefix(text):
+        return text == "" or text.isdigit()
+    
+    @staticmethod
+    def _is_float_prefix(text):
+        return _FLOAT_PREFIX.fullmatch(text) is not None
+    
+    def _show_tip(self, event):
+        event.widget.master._tip.config(text=event.widget._tooltip)
+    
+    def _hide_tip(self, event):
+        event.widget.master._tip.config(text="")
     
     def browse_output_file(self):
         """Open file browser for output file selection"""
@@ -256,113 +396,154 @@ class CountdownGUI:
         if filename:
             self.vars['outfile'].set(filename)
     
-    def build_command(self):
-        """Build the command line arguments for countdown_builder.py"""
-        cmd = [sys.executable, "countdown_builder.py"]
-        
-        # Add all parameters
-        for param, var in self.vars.items():
-            value = var.get()
-            
+    def _snapshot(self):
+        """Read every Tk variable once into a plain dict (raises TclError on unparsable numbers)"""
+        return {name: var.get() for name, var in self.vars.items()}
+    
+    def _collect_params(self, snapshot):
+        """Turn a snapshot into countdown_builder.build params"""
+        params = {}
+        for param, value in snapshot.items():
             # Skip empty string values for optional parameters
             if param in ['lead_in', 'end_with'] and not value:
                 continue
             
-            # Convert parameter name to command line format
-            param_name = param.replace('_', '-')
-            cmd.extend([f"--{param_name}", str(value)])
+            params[param] = value
         
-        return cmd
+        return params
     
-    def generate_countdown(self):
-        """Generate the countdown audio in a separate thread"""
-        if self.is_generating:
-            return
-        
-        # Validate inputs
+    def _revalidate(self, *_):
+        """Var trace callback: check the numeric inputs and enable Generate only when they are usable"""
+        error = None
         try:
+            for name in self.NUMERIC_FIELDS:
+                self.vars[name].get()
             if self.vars['start'].get() <= 0:
-                messagebox.showerror("Error", "Starting number must be positive")
-                return
-            if self.vars['interval'].get() <= 0:
-                messagebox.showerror("Error", "Interval must be positive")
-                return
+                error = "Starting number must be positive"
+            elif self.vars['interval'].get() <= 0:
+                error = "Interval must be positive"
         except tk.TclError:
-            messagebox.showerror("Error", "Please enter valid numbers")
+            error = "Please enter valid numbers"
+        
+        if not self.is_generating:
+            self.generate_btn.config(state=tk.NORMAL if error is None else tk.DISABLED)
+        if error is not None:
+            self.status_label.config(text=error)
+        elif self._input_error is not None:
+            self.status_label.config(text="Ready to generate countdown")
+        self._input_error = error
+    
+    def generate_countdown(self):
+        """Generate the countdown audio in a separate thread"""
+        # Inputs were validated as they were typed (see _revalidate)
+        if self.is_generating or self._input_error is not None:
             return
         
-        # Check if countdown_builder.py exists
-        if not Path("countdown_builder.py").exists():
-            messagebox.showerror("Error", "countdown_builder.py not found in current directory")
-            return
+        # Tk variables must be read on the main thread; read them all once
+        snapshot = self._snapshot()
+        self._last_params = snapshot
+        params = self._collect_params(snapshot)
         
         # Start generation in thread
         self.is_generating = True
         self.generate_btn.config(state=tk.DISABLED)
         self.preview_btn.config(state=tk.DISABLED)
-        self.progress.start()
+        self.progress.config(value=0)
         self.status_label.config(text="Generating countdown audio...")
+        self.log.config(state=tk.NORMAL)
+        self.log.delete('1.0', tk.END)
+        self.log.config(state=tk.DISABLED)
         
-        thread = threading.Thread(target=self.run_generation, daemon=True)
+        thread = threading.Thread(target=self.run_generation, args=(params,), daemon=True)
         thread.start()
+        self.root.after(50, self._poll_output)
     
-    def run_generation(self):
-        """Run the countdown generation process"""
+    def run_generation(self, params):
+        """Run the countdown generation in-process"""
         try:
-            cmd = self.build_command()
-            
-            # Run the countdown builder
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=".")
+            # Route the builder's prints to the Tk thread instead of the terminal
+            with contextlib.redirect_stdout(_QueueWriter(self._output_q)):
+                if not self._cache_lock.acquire(blocking=False):
+                    print("Waiting for the preset's voices to finish downloading...")
+                    self._cache_lock.acquire()
+                try:
+                    output_file = cb.build(params, self.cache_dir)
+                finally:
+                    self._cache_lock.release()
             
             # Update UI on main thread
-            self.root.after(0, self.generation_complete, result)
+            self.root.after(0, self.generation_complete, output_file)
             
         except Exception as e:
             self.root.after(0, self.generation_error, str(e))
     
-    def generation_complete(self, result):
+    def _poll_output(self):
+        """Show queued builder output; reschedules itself until generation finishes"""
+        self._drain_output()
+        if self.is_generating:
+            self.root.after(50, self._poll_output)
+    
+    def _drain_output(self):
+        lines = []
+        while True:
+            try:
+                lines.append(self._output_q.get_nowait())
+            except queue.Empty:
+                break
+        if not lines:
+            return
+        
+        for line in lines:
+            if line.startswith("progress "):
+                done, total = line.split()[1].split("/")
+                self.progress.config(value=100 * int(done) / int(total))
+                self.status_label.config(text=f"Fetching voices ({done}/{total})...")
+        
+        self.log.config(state=tk.NORMAL)
+        self.log.insert(tk.END, "\n".join(lines) + "\n")
+        self.log.see(tk.END)
+        self.log.config(state=tk.DISABLED)
+    
+    def generation_complete(self, output_file):
         """Handle completion of countdown generation"""
         self.is_generating = False
-        self.generate_btn.config(state=tk.NORMAL)
-        self.progress.stop()
-        
-        if result.returncode == 0:
-            self.status_label.config(text="Countdown generated successfully!")
-            self.preview_btn.config(state=tk.NORMAL)
-            
-            # Show output
-            output_file = self.vars['outfile'].get()
-            messagebox.showinfo("Success", 
-                              f"Countdown audio generated successfully!\n\n"
-                              f"Output file: {output_file}\n"
-                              f"Timeline file: {Path(output_file).with_suffix('.json')}")
-        else:
-            self.status_label.config(text="Generation failed!")
-            error_msg = result.stderr if result.stderr else result.stdout
-            messagebox.showerror("Error", f"Generation failed:\n{error_msg}")
+        self._drain_output()
+        if self._input_error is None:
+            self.generate_btn.config(state=tk.NORMAL)
+        self.progress.config(value=100)
+        
+        self.status_label.config(text="Countdown generated successfully!")
+        self.preview_btn.config(state=tk.NORMAL)
+        
+        # Show output
+        messagebox.showinfo("Success", 
+                          f"Countdown audio generated successfully!\n\n"
+                          f"Output file: {output_file}\n"
+                          f"Timeline file: {Path(output_file).with_suffix('.json')}")
     
     def generation_error(self, error):
         """Handle generation error"""
         self.is_generating = False
-        self.generate_btn.config(state=tk.NORMAL)
-        self.progress.stop()
+        self._drain_output()
+        if self._input_error is None:
+            self.generate_btn.config(state=tk.NORMAL)
+        self.progress.config(value=0)
         self.status_label.config(text="Generation failed!")
         messagebox.showerror("Error", f"An error occurred:\n{error}")
     
     def preview_audio(self):
         """Preview the generated audio file"""
-        output_file = self.vars['outfile'].get()
+        # The file from the last generation, even if the field was edited since
+        output_file = self._last_params['outfile']
         
         if not Path(output_file).exists():
             messagebox.showerror("Error", f"Output file {output_file} not found")
             return
         
         try:
-            # Try to open with default system player
-            if sys.platform.startswith('linux'):
-                subprocess.run(['xdg-open', output_file])
-            elif sys.platform.startswith('darwin'):  # macOS
-                subprocess.run(['open', output_file])
+            # Hand off to the default system player without waiting for it
+            if self._opener:
+                subprocess.Popen(self._opener + [output_file])
             elif sys.platform.startswith('win'):  # Windows
                 os.startfile(output_file)
             else:
@@ -370,6 +551,14 @@ class CountdownGUI:
         except Exception as e:
             messagebox.showerror("Error", f"Could not open audio file:\n{e}")
     
+    def prewarm_cache(self, params):
+        """Fill the TTS cache for params; failures are left for Generate to report"""
+        try:
+            with self._cache_lock:
+                cb.prewarm(params, self.cache_dir)
+        except Exception:
+            pass
+    
     def save_preset(self):
         """Save current settings as a preset"""
         filename = filedialog.asksaveasfilename(
@@ -380,12 +569,16 @@ class CountdownGUI:
         
         if filename:
             try:
-                preset = {}
-                for name, var in self.vars.items():
-                    preset[name] = var.get()
+                preset = self._snapshot()
+                if orjson is not None:
+                    data = orjson.dumps(preset, option=orjson.OPT_INDENT_2)
+                else:
+                    data = json.dumps(preset, indent=2).encode("utf-8")
                 
-                with open(filename, 'w') as f:
-                    json.dump(preset, f, indent=2)
+                # Write-then-rename so a failed save never clobbers an existing preset
+                tmp_path = Path(filename + ".tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, filename)
                 
                 messagebox.showinfo("Success", f"Preset saved to {filename}")
             except Exception as e:
@@ -400,13 +593,16 @@ class CountdownGUI:
         
         if filename:
             try:
-                with open(filename, 'r') as f:
-                    preset = json.load(f)
+                data = Path(filename).read_bytes()
+                preset = orjson.loads(data) if orjson is not None else json.loads(data)
                 
                 for name, value in preset.items():
                     if name in self.vars:
                         self.vars[name].set(value)
                 
+                # Fetch the preset's voices in the background so Generate only hits the cache
+                threading.Thread(target=self.prewarm_cache, args=(self._collect_params(self._snapshot()),), daemon=True).start()
+                
                 messagebox.showinfo("Success", f"Preset loaded from {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Could not load preset:\n{e}")
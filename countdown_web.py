@@ -6,77 +6,290 @@ A web-based interface for controlling the countdown_builder.py script.
 Works in any browser without requiring GUI libraries.
 """
 
+import contextlib
+import gzip
+import io
 import json
-import subprocess
+import logging
+import multiprocessing
+import os
+import socket
+import stat
 import sys
 import threading
 import time
+from collections import deque
+from itertools import chain
 from pathlib import Path
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import urllib.parse
-import socketserver
 import webbrowser
-import cgi
+import re
 from io import StringIO
 
+log = logging.getLogger(__name__)
+
+_BOUNDARY_RE = re.compile(r'boundary="?([^";]+)"?')
+_FIELD_NAME_RE = re.compile(rb'name="([^"]*)"')
+_READ_CHUNK = 64 * 1024
+
+# The form is a couple of dozen short fields; anything far bigger is not from our page
+MAX_BODY = 64 * 1024
+MAX_FIELDS = 64
+
+def parse_multipart(rfile, length, boundary):
+    """Parse a text-only multipart/form-data body into {name: [value]}, skipping file uploads.
+
+    Reads `length` bytes in fixed chunks and splits on the boundary; there is no temp-file
+    rollover since every field this page submits is a short string.
+    """
+    chunks = []
+    remaining = length
+    while remaining > 0:
+        chunk = rfile.read(min(_READ_CHUNK, remaining))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    body = b"".join(chunks)
+    
+    params = {}
+    for part in body.split(b"--" + boundary):
+        # Each part is "\r\n<headers>\r\n\r\n<value>\r\n"; the last one is "--\r\n"
+        head, sep, value = part.partition(b"\r\n\r\n")
+        if not sep:
+            continue
+        disposition = next((line for line in head.split(b"\r\n")
+                            if line.lower().startswith(b"content-disposition:")), b"")
+        name = _FIELD_NAME_RE.search(disposition)
+        if name is None or b"filename=" in disposition:
+            continue
+        if value.endswith(b"\r\n"):
+            value = value[:-2]
+        params.setdefault(name.group(1).decode("utf-8"), []).append(value.decode("utf-8"))
+    return params
+
+# (form field, countdown_builder flag) pairs, in the order the arguments are passed
+_PARAM_MAP = (
+    ('start', '--start'),
+    ('interval', '--interval'),
+    ('long_interval', '--long-interval'),
+    ('every_n', '--every-n'),
+    ('lang', '--lang'),
+    ('tld', '--tld'),
+    ('beep_freq', '--beep-freq'),
+    ('beep_ms', '--beep-ms'),
+    ('beep_gain', '--beep-gain'),
+    ('fade_ms', '--fade-ms'),
+    ('outfile', '--outfile'),
+    ('out_bitrate', '--out-bitrate'),
+    ('lead_in', '--lead-in'),
+    ('lead_in_gap_ms', '--lead-in-gap-ms'),
+    ('rest_text', '--rest-text'),
+    ('skip_first_rest', '--skip-first-rest'),
+    ('end_with', '--end-with'),
+)
+
+class _PipeWriter(io.TextIOBase):
+    """stdout/stderr stand-in inside the worker: sends each complete line to the server"""
+    
+    def __init__(self, conn):
+        self._conn = conn
+        self._buf = ""
+    
+    def write(self, s):
+        self._buf += s
+        *lines, self._buf = self._buf.split("\n")
+        for line in lines:
+            self._conn.send(("line", line))
+        return len(s)
+    
+    def flush(self):
+        if self._buf:
+            self._conn.send(("line", self._buf))
+            self._buf = ""
+
+def _worker_main(conn):
+    """Builder worker loop: receive CLI argv lists, build, reply; heavy imports happen once"""
+    import countdown_builder as cb
+    
+    writer = _PipeWriter(conn)
+    while True:
+        try:
+            argv = conn.recv()
+        except EOFError:
+            return
+        try:
+            with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+                outfile = cb.generate(cb.parse_args(argv))
+            reply = ("done", str(outfile))
+        except SystemExit:  # argparse rejected the arguments; its message went out as lines
+            reply = ("error", "invalid parameters")
+        except Exception as e:
+            reply = ("error", str(e))
+        writer.flush()
+        conn.send(reply)
+
+class BuilderWorker:
+    """One long-lived process with countdown_builder already imported, fed over a Pipe.
+    
+    Saves the interpreter start-up and the numpy/pydub/gTTS imports on every generation.
+    Started from a forkserver (spawn where that is unavailable) so it is not forked from
+    the threaded server.
+    """
+    
+    def __init__(self):
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._proc = None
+        self._conn = None
+        self._lock = threading.Lock()
+    
+    def start(self):
+        if self._proc is not None and self._proc.is_alive():
+            return
+        self._conn, child_conn = self._ctx.Pipe()
+        self._proc = self._ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self._proc.start()
+        child_conn.close()
+    
+    def run(self, argv, on_line):
+        """Build with CLI-style argv; on_line gets each output line. Returns (ok, outfile or error)."""
+        with self._lock:
+            self.start()
+            try:
+                self._conn.send(argv)
+                while True:
+                    kind, value = self._conn.recv()
+                    if kind == "line":
+                        on_line(value)
+                    else:
+                        return kind == "done", value
+            except (EOFError, OSError):
+                # Worker died mid-build (e.g. killed); the next run starts a fresh one
+                self._proc = None
+                return False, "builder worker exited unexpectedly"
+
+_WORKER = BuilderWorker()
+
 class CountdownWebHandler(SimpleHTTPRequestHandler):
-    # Class variable to share status between requests
+    # Class variables to share status between requests; written only via _set_status, under the lock.
+    # The JSON form is rebuilt once per change, so /status just writes the cached bytes.
+    # /events streams waiters block on _status_cond, which shares the lock and is notified per change.
     generation_status = {"running": False, "message": "Ready", "file": None}
+    _status_json = json.dumps(generation_status).encode()
+    _status_lock = threading.Lock()
+    _status_cond = threading.Condition(_status_lock)
+    
+    @classmethod
+    def _store_status(cls, running, message, file):
+        # Caller holds _status_lock
+        cls.generation_status = {"running": running, "message": message, "file": file}
+        cls._status_json = json.dumps(cls.generation_status).encode()
+        cls._status_cond.notify_all()
+    
+    @classmethod
+    def _set_status(cls, running, message, file=None):
+        with cls._status_lock:
+            cls._store_status(running, message, file)
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
     
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; don't let Nagle hold the body back for an ACK
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
     def do_GET(self):
         if self.path == "/" or self.path == "/index.html":
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body, length = _MAIN_PAGE_GZ, _MAIN_PAGE_GZ_LEN
+            else:
+                body, length = _MAIN_PAGE_BYTES, _MAIN_PAGE_LEN
             self.send_response(200)
-            self.send_header('Content-type', 'text/html')
+            self.send_header('Content-type', 'text/html; charset=utf-8')
+            if body is _MAIN_PAGE_GZ:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Content-Length', length)
             self.end_headers()
-            self.wfile.write(self.get_main_page().encode())
+            self.wfile.write(body)
         elif self.path == "/status":
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.end_headers()
-            self.wfile.write(json.dumps(CountdownWebHandler.generation_status).encode())
+            with CountdownWebHandler._status_lock:
+                body = CountdownWebHandler._status_json
+            self.wfile.write(body)
+        elif self.path == "/events":
+            self.send_events()
         elif self.path.startswith("/download/"):
-            filename = self.path[10:]  # Remove /download/
-            if Path(filename).exists():
+            filename = urllib.parse.unquote(self.path[10:])  # Remove /download/
+            
+            # Only serve files under the working directory (no ../ or absolute-path escapes)
+            path = Path(filename).resolve()
+            if Path.cwd().resolve() not in path.parents:
+                self.send_error(403, "Forbidden")
+                return
+            
+            try:
+                # O_NOFOLLOW: refuse a symlink swapped in after the resolve() above
+                fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+            except OSError:
+                self.send_error(404, "File not found")
+                return
+            
+            st = os.fstat(fd)
+            if not stat.S_ISREG(st.st_mode):
+                os.close(fd)
+                self.send_error(404, "File not found")
+                return
+            size = st.st_size
+            
+            with os.fdopen(fd, 'rb') as f:
                 self.send_response(200)
                 self.send_header('Content-type', 'audio/mpeg')
-                self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+                self.send_header('Content-Disposition', f'attachment; filename="{path.name}"')
+                self.send_header('Content-Length', str(size))
                 self.end_headers()
-                with open(filename, 'rb') as f:
-                    self.wfile.write(f.read())
-            else:
-                self.send_error(404, "File not found")
+                # Kernel-side copy via os.sendfile where available; socket.sendfile falls back to send() elsewhere
+                self.connection.sendfile(f, 0, size)
         else:
             super().do_GET()
     
     def do_POST(self):
         if self.path == "/generate":
+            length_header = self.headers.get('Content-Length')
+            if length_header is None:
+                self.send_error(411, "Content-Length required")
+                return
+            
             try:
+                content_length = int(length_header) if length_header.strip().isdigit() else -1
+                if content_length < 0:
+                    raise ValueError(f"Invalid Content-Length: {length_header}")
+                if content_length > MAX_BODY:
+                    # Refuse before reading; send_error also closes the connection
+                    self.send_error(413, "Request body too large")
+                    return
+                
                 # Parse multipart form data
                 content_type = self.headers.get('Content-Type', '')
                 if content_type.startswith('multipart/form-data'):
                     # Handle multipart form data
-                    form = cgi.FieldStorage(
-                        fp=self.rfile,
-                        headers=self.headers,
-                        environ={'REQUEST_METHOD': 'POST'}
-                    )
-                    
-                    # Convert to the expected format
-                    params = {}
-                    for field_name in form.keys():
-                        field = form[field_name]
-                        if field.filename is None:  # Regular field, not file upload
-                            params[field_name] = [field.value]
+                    match = _BOUNDARY_RE.search(content_type)
+                    if not match:
+                        raise ValueError("multipart/form-data without a boundary")
+                    params = parse_multipart(self.rfile, content_length, match.group(1).encode())
                 else:
                     # Handle URL-encoded form data
-                    content_length = int(self.headers['Content-Length'])
                     post_data = self.rfile.read(content_length)
-                    params = urllib.parse.parse_qs(post_data.decode())
+                    params = {}
+                    for name, value in urllib.parse.parse_qsl(post_data.decode("utf-8"), max_num_fields=MAX_FIELDS):
+                        params.setdefault(name, []).append(value)
                 
-                print(f"DEBUG: Received form data: {params}", flush=True)
+                log.debug("Received form data: %s", params)
                 # Convert form data to countdown_builder arguments
                 self.start_generation(params)
                 
@@ -92,83 +305,69 @@ class CountdownWebHandler(SimpleHTTPRequestHandler):
         else:
             self.send_error(404, "Not found")
     
+    def send_events(self):
+        """Stream status changes as Server-Sent Events until the client goes away"""
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        cond = CountdownWebHandler._status_cond
+        with cond:
+            body = CountdownWebHandler._status_json
+        try:
+            self.wfile.write(b"data: " + body + b"\n\n")
+            self.wfile.flush()
+            while True:
+                with cond:
+                    # Wake on the next change; on timeout a comment line notices clients that have left
+                    changed = cond.wait_for(lambda: CountdownWebHandler._status_json is not body, 15)
+                    body = CountdownWebHandler._status_json
+                self.wfile.write(b"data: " + body + b"\n\n" if changed else b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
     def start_generation(self, params):
         """Start countdown generation in background thread"""
-        if CountdownWebHandler.generation_status["running"]:
-            return
-        
-        CountdownWebHandler.generation_status = {"running": True, "message": "Generating...", "file": None}
+        # Check-and-set in one step so two simultaneous POSTs can't both start a build
+        with CountdownWebHandler._status_lock:
+            if CountdownWebHandler.generation_status["running"]:
+                return
+            CountdownWebHandler._store_status(True, "Generating...", None)
         
         def generate():
             try:
-                # Build command
-                cmd = [sys.executable, "countdown_builder.py"]
+                # Build command-line arguments for the builder; blank fields fall back to the
+                # builder defaults ("0" is non-empty, so numeric zeros pass)
+                fields = ((flag, params[param][0].strip()) for param, flag in _PARAM_MAP if param in params)
+                cmd = list(chain.from_iterable((flag, value) for flag, value in fields if value))
                 
-                # Map form parameters to command line arguments
-                param_map = {
-                    'start': '--start',
-                    'interval': '--interval', 
-                    'long_interval': '--long-interval',
-                    'every_n': '--every-n',
-                    'lang': '--lang',
-                    'tld': '--tld',
-                    'beep_freq': '--beep-freq',
-                    'beep_ms': '--beep-ms',
-                    'beep_gain': '--beep-gain',
-                    'fade_ms': '--fade-ms',
-                    'outfile': '--outfile',
-                    'out_bitrate': '--out-bitrate',
-                    'lead_in': '--lead-in',
-                    'lead_in_gap_ms': '--lead-in-gap-ms',
-                    'rest_text': '--rest-text',
-                    'skip_first_rest': '--skip-first-rest',
-                    'end_with': '--end-with'
-                }
+                log.debug("Builder arguments: %s", cmd)
                 
-                for param, flag in param_map.items():
-                    if param in params:
-                        value = params[param][0].strip()
-                        # Always include numeric parameters even if they're 0 or empty string
-                        if value or param in ['start', 'interval', 'long_interval', 'every_n', 'beep_freq', 'beep_ms', 'beep_gain', 'fade_ms', 'lead_in_gap_ms', 'skip_first_rest']:
-                            if value:  # Only add if there's actually a value
-                                cmd.extend([flag, value])
+                # Run generation in the warm worker, passing each output line on to /status as it arrives
+                tail = deque(maxlen=20)  # kept for the failure message
                 
-                # Debug: Print the command being executed
-                print(f"DEBUG: Executing command: {' '.join(cmd)}", flush=True)
+                def on_line(line):
+                    log.debug("Output: %s", line)
+                    tail.append(line)
+                    CountdownWebHandler._set_status(True, line)
                 
-                # Run generation
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                ok, result = _WORKER.run(cmd, on_line)
                 
-                # Debug: Print the result
-                print(f"DEBUG: Return code: {result.returncode}", flush=True)
-                print(f"DEBUG: STDOUT: {result.stdout}", flush=True)
-                print(f"DEBUG: STDERR: {result.stderr}", flush=True)
+                log.debug("Result: %s %s", ok, result)
                 
-                if result.returncode == 0:
+                if ok:
                     outfile = params.get('outfile', ['countdown_combined.mp3'])[0]
-                    CountdownWebHandler.generation_status = {
-                        "running": False, 
-                        "message": "Generation completed successfully!", 
-                        "file": outfile
-                    }
+                    CountdownWebHandler._set_status(False, "Generation completed successfully!", outfile)
                 else:
-                    CountdownWebHandler.generation_status = {
-                        "running": False, 
-                        "message": f"Generation failed: {result.stderr or result.stdout}", 
-                        "file": None
-                    }
+                    CountdownWebHandler._set_status(False, f"Generation failed: {result}\n" + "\n".join(tail))
             except Exception as e:
-                CountdownWebHandler.generation_status = {
-                    "running": False, 
-                    "message": f"Error: {str(e)}", 
-                    "file": None
-                }
+                CountdownWebHandler._set_status(False, f"Error: {str(e)}")
         
         thread = threading.Thread(target=generate, daemon=True)
         thread.start()
-    
-    def get_main_page(self):
-        return """<!DOCTYPE html>
+
+_MAIN_PAGE = """<!DOCTYPE html>
 <html>
 <head>
     <title>Countdown Audio Builder</title>
@@ -387,7 +586,7 @@ class CountdownWebHandler(SimpleHTTPRequestHandler):
             .then(response => response.json())
             .then(data => {
                 if (data.status === 'started') {
-                    checkStatus();
+                    watchStatus();
                 } else {
                     showError(data.error || 'Unknown error');
                 }
@@ -397,10 +596,10 @@ class CountdownWebHandler(SimpleHTTPRequestHandler):
             });
         }
 
-        function checkStatus() {
-            fetch('/status')
-            .then(response => response.json())
-            .then(data => {
+        function watchStatus() {
+            const events = new EventSource('/events');
+            events.onmessage = event => {
+                const data = JSON.parse(event.data);
                 if (data.running) {
                     document.getElementById('status').innerHTML = `
                         <div class="status info">
@@ -408,8 +607,8 @@ class CountdownWebHandler(SimpleHTTPRequestHandler):
                             ${data.message}
                         </div>
                     `;
-                    setTimeout(checkStatus, 1000);
                 } else {
+                    events.close();
                     const generateBtn = document.getElementById('generateBtn');
                     generateBtn.disabled = false;
                     generateBtn.textContent = '🎵 Generate Countdown';
@@ -424,7 +623,7 @@ class CountdownWebHandler(SimpleHTTPRequestHandler):
                         showError(data.message);
                     }
                 }
-            });
+            };
         }
 
         function showError(message) {
@@ -498,20 +697,37 @@ class CountdownWebHandler(SimpleHTTPRequestHandler):
 </body>
 </html>"""
 
+# Encoded (and gzipped) once at import; GET / just writes one of these
+_MAIN_PAGE_BYTES = _MAIN_PAGE.encode("utf-8")
+_MAIN_PAGE_LEN = str(len(_MAIN_PAGE_BYTES))
+_MAIN_PAGE_GZ = gzip.compress(_MAIN_PAGE_BYTES, compresslevel=9)
+_MAIN_PAGE_GZ_LEN = str(len(_MAIN_PAGE_GZ))
+
 def start_server(port=8001):
     """Start the web server"""
     handler = CountdownWebHandler
-    with socketserver.TCPServer(("", port), handler) as httpd:
+    # One daemon thread per connection, so a slow download never holds up /status polls
+    # and open connections don't keep the process alive after Ctrl+C
+    with ThreadingHTTPServer(("", port), handler) as httpd:
         print(f"🌐 Countdown Builder Web Interface")
         print(f"📡 Server running at: http://localhost:{port}")
         print(f"🎵 Open the URL above in your browser to use the interface")
         print(f"⌨️  Press Ctrl+C to stop the server")
         
-        # Try to open browser automatically
-        try:
-            webbrowser.open(f'http://localhost:{port}')
-        except:
-            pass
+        # Start the builder worker now so the first generation finds it warm
+        _WORKER.start()
+        
+        # Try to open browser automatically, off the main thread so a slow
+        # browser launch doesn't hold up serve_forever
+        def open_browser():
+            try:
+                webbrowser.open(f'http://localhost:{port}')
+            except Exception:
+                pass
+        
+        opener = threading.Timer(0.2, open_browser)
+        opener.daemon = True
+        opener.start()
         
         try:
             httpd.serve_forever()
@@ -519,6 +735,11 @@ def start_server(port=8001):
             print("\n🛑 Server stopped")
 
 if __name__ == "__main__":
+    # -v shows the form data, builder arguments and output of each generation
+    verbose = "-v" in sys.argv[1:]
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.WARNING,
+                        format="%(levelname)s: %(message)s")
+    
     # Check if countdown_builder.py exists
     if not Path("countdown_builder.py").exists():
         print("❌ Error: countdown_builder.py not found in current directory")